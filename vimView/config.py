@@ -1,13 +1,43 @@
 import json
+import os
+import stat
 from pathlib import Path
 
-CONFIG_DIR = Path.home() / ".config" / "vimView"
-CONFIG_FILE = CONFIG_DIR / "config.json"
-SESSION_FILE = CONFIG_DIR / "session.json"
-DEFAULT_DIR = Path.home() / "Pictures" / "Photo"
+from PySide6.QtCore import QTimer
 
-DEFAULT_CONFIG = {
-    "settings": {"require_confirmation": False, "show_filename": True},
+try:
+    import orjson
+except ImportError:  # optional speed-up, fall back to the stdlib parser
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(obj, indent: bool = True) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+else:
+    _loads = json.loads
+
+    def _dumps(obj, indent: bool = True) -> bytes:
+        if indent:
+            return json.dumps(obj, indent=2).encode("utf-8")
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+HOME = Path.home()
+
+# Plain str paths for the hot read/write path; Path aliases for callers.
+CONFIG_DIR_S = os.path.join(str(HOME), ".config", "vimView")
+CONFIG_FILE_S = os.path.join(CONFIG_DIR_S, "config.json")
+SESSION_FILE_S = os.path.join(CONFIG_DIR_S, "session.json")
+CONFIG_DIR = Path(CONFIG_DIR_S)
+CONFIG_FILE = Path(CONFIG_FILE_S)
+SESSION_FILE = Path(SESSION_FILE_S)
+DEFAULT_DIR = HOME / "Pictures" / "Photo"
+
+# Kept as a JSON literal so import hands one buffer to the C parser
+# instead of evaluating a large nested dict display.
+_DEFAULT_CONFIG_JSON = b"""{
+    "settings": {"require_confirmation": false, "show_filename": true, "low_memory": false},
     "keymap": {
         "next": "l",
         "prev": "h",
@@ -30,7 +60,7 @@ DEFAULT_CONFIG = {
         "undo": "u",
         "show_keys": "k",
         "edit_config": "e",
-        "quit": "q",
+        "quit": "q"
     },
     "quick_folders": {"b": "folder_1", "n": "folder_2"},
     "theme": {
@@ -39,54 +69,138 @@ DEFAULT_CONFIG = {
         "surface": "#050505",
         "text": "#ffffff",
         "dim_text": "#666666",
-        "border": "#333333",
-    },
-}
+        "border": "#333333"
+    }
+}"""
+
+DEFAULT_CONFIG = _loads(_DEFAULT_CONFIG_JSON)
+# Serialized once so the first-run save_config is a plain write.
+_DEFAULT_CONFIG_BYTES = _dumps(DEFAULT_CONFIG)
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+def _write_atomic(path: str, payload: bytes, sync: bool = False) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+# Single-entry caches of the last parsed file, keyed by its st_mtime_ns.
+_config_cache: tuple[int, dict] | None = None
+_session_cache: tuple[int, dict] | None = None
+
+def _merge_with_defaults(data: dict) -> dict:
+    """Overlay user sections on fresh copies of the defaults, skipping any that are not objects."""
+    merged = {key: dict(section) for key, section in DEFAULT_CONFIG.items()}
+    for key in ("settings", "keymap", "theme"):
+        section = data.get(key)
+        if isinstance(section, dict):
+            merged[key] |= section
+    if isinstance(data.get("quick_folders"), dict):
+        merged["quick_folders"] = data["quick_folders"]
+    # Keys are matched case-insensitively; normalize once here.
+    merged["keymap"] = {
+        k: v.lower() if isinstance(v, str) else v for k, v in merged["keymap"].items()
+    }
+    return merged
 
 def load_config() -> dict:
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE) as f:
-                data = json.load(f)
-                merged = DEFAULT_CONFIG.copy()
-                for key in merged:
-                    if key in data and isinstance(data[key], dict):
-                        merged[key].update(data[key])
-                if "quick_folders" in data:
-                    merged["quick_folders"] = data["quick_folders"]
-                return merged
-        except json.JSONDecodeError:
-            pass
+    global _config_cache
+    try:
+        mtime = os.stat(CONFIG_FILE_S).st_mtime_ns
+        if _config_cache is not None and _config_cache[0] == mtime:
+            return _config_cache[1]
+        data = _loads(_read_bytes(CONFIG_FILE_S))
+    except (FileNotFoundError, ValueError):
+        data = None
+    if isinstance(data, dict):
+        merged = _merge_with_defaults(data)
+        _config_cache = (mtime, merged)
+        return merged
+    # missing, unparseable or not a JSON object
     save_config(DEFAULT_CONFIG)
-    return DEFAULT_CONFIG
+    return _merge_with_defaults({})
 
 def save_config(config: dict) -> None:
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=4)
+    """Write config pretty-printed for hand editing, synced to disk."""
+    global _config_cache
+    _config_cache = None
+    payload = _DEFAULT_CONFIG_BYTES if config is DEFAULT_CONFIG else _dumps(config)
+    os.makedirs(CONFIG_DIR_S, exist_ok=True)
+    _write_atomic(CONFIG_FILE_S, payload, sync=True)
+
+def save_config_fast(config: dict) -> None:
+    """Compact, unsynced save_config for frequent in-session toggles.
+
+    Follow up with save_config before the user is expected to read the file.
+    """
+    global _config_cache
+    _config_cache = None
+    os.makedirs(CONFIG_DIR_S, exist_ok=True)
+    _write_atomic(CONFIG_FILE_S, _dumps(config, indent=False))
+
+class _SessionWriter:
+    """Coalesces session saves into one deferred, atomic write."""
+
+    DELAY_MS = 500
+
+    def __init__(self):
+        self._timer: QTimer | None = None
+        self._pending: dict | None = None
+
+    def schedule(self, data: dict):
+        self._pending = data
+        if self._timer is None:
+            self._timer = QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self.flush)
+        if not self._timer.isActive():
+            self._timer.start(self.DELAY_MS)
+
+    def flush(self):
+        global _session_cache
+        if self._timer is not None:
+            self._timer.stop()
+        if self._pending is None:
+            return
+        data, self._pending = self._pending, None
+        _session_cache = None
+        _write_atomic(SESSION_FILE_S, _dumps(data, indent=False))
+
+_session_writer = _SessionWriter()
 
 def save_session(last_dir: Path | None, last_index: int = 0):
-    """Save the last viewed directory and image index."""
+    """Save the last viewed directory and image index (written shortly after)."""
     data = {}
     if last_dir:
         data["last_dir"] = str(last_dir)
         data["last_index"] = last_index
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    with open(SESSION_FILE, "w") as f:
-        json.dump(data, f)
+    _session_writer.schedule(data)
+
+def flush_session():
+    """Write any pending session state to disk immediately."""
+    _session_writer.flush()
 
 def load_session() -> tuple[Path | None, int]:
     """Return (last_dir Path or None, last_index)."""
-    if not SESSION_FILE.exists():
-        return None, 0
+    global _session_cache
+    flush_session()
     try:
-        with open(SESSION_FILE) as f:
-            data = json.load(f)
+        mtime = os.stat(SESSION_FILE_S).st_mtime_ns
+        if _session_cache is not None and _session_cache[0] == mtime:
+            data = _session_cache[1]
+        else:
+            data = _loads(_read_bytes(SESSION_FILE_S))
+            _session_cache = (mtime, data)
         if "last_dir" in data:
-            p = Path(data["last_dir"])
-            if p.exists() and p.is_dir():
-                return p, data.get("last_index", 0)
-    except (json.JSONDecodeError, KeyError, TypeError):
+            st = os.stat(data["last_dir"])
+            if stat.S_ISDIR(st.st_mode):
+                return Path(data["last_dir"]), data.get("last_index", 0)
+    except (OSError, ValueError, KeyError, TypeError):
         pass
     return None, 0
@@ -1,14 +1,45 @@
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 from PySide6.QtWidgets import QApplication, QStackedWidget, QMainWindow
 from PySide6.QtGui import QFont
 
-from config import load_config, load_session
+from config import load_config, load_session, flush_session
 from utils import load_custom_font
 from widgets.home_widget import HomeWidget
 from widgets.image_viewer import ImageViewerWidget
 
+_STYLE_TEMPLATE = """
+    QWidget {{
+        background-color: {background};
+        color: {text};
+        font-family: "{app_font}";
+    }}
+    QScrollBar {{
+        background: {background};
+        width: 8px;
+    }}
+    QScrollBar::handle {{
+        background: {border};
+    }}
+    QPushButton {{
+        background-color: {background};
+        border: 1px dotted {text};
+        padding: 5px;
+    }}
+    QPushButton:hover {{
+        border: 1px solid {accent};
+        color: {accent};
+    }}
+"""
+
+@lru_cache(maxsize=4)
+def _global_style(background: str, text: str, accent: str, border: str, app_font: str) -> str:
+    return _STYLE_TEMPLATE.format(
+        background=background, text=text, accent=accent, border=border, app_font=app_font
+    )
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -23,48 +54,29 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(self.stack)
 
         self.home_view = HomeWidget(self.config, self.app_font)
-        self.viewer_view = ImageViewerWidget(self.config, self.app_font)
+        self.viewer_view: ImageViewerWidget | None = None   # built on first use
 
         self.stack.addWidget(self.home_view)
-        self.stack.addWidget(self.viewer_view)
 
         self.home_view.open_dir.connect(self.switch_to_viewer)
         self.home_view.restore_session.connect(self.load_last_session)
-        self.viewer_view.go_home.connect(self.switch_to_home)
 
         self.home_view.setFocus()
 
     def _apply_global_style(self):
-        t_bg = self.config["theme"]["background"]
-        t_txt = self.config["theme"]["text"]
-        t_acc = self.config["theme"]["accent"]
-        t_bord = self.config["theme"]["border"]
-
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {t_bg};
-                color: {t_txt};
-                font-family: "{self.app_font}";
-            }}
-            QScrollBar {{
-                background: {t_bg};
-                width: 8px;
-            }}
-            QScrollBar::handle {{
-                background: {t_bord};
-            }}
-            QPushButton {{
-                background-color: {t_bg};
-                border: 1px dotted {t_txt};
-                padding: 5px;
-            }}
-            QPushButton:hover {{
-                border: 1px solid {t_acc};
-                color: {t_acc};
-            }}
-        """)
+        theme = self.config["theme"]
+        self.setStyleSheet(_global_style(
+            theme["background"], theme["text"], theme["accent"], theme["border"], self.app_font
+        ))
+
+    def _ensure_viewer(self):
+        if self.viewer_view is None:
+            self.viewer_view = ImageViewerWidget(self.config, self.app_font)
+            self.stack.addWidget(self.viewer_view)
+            self.viewer_view.go_home.connect(self.switch_to_home)
 
     def switch_to_viewer(self, directory: Path):
+        self._ensure_viewer()
         self.viewer_view.load_directory(directory)
         self.stack.setCurrentWidget(self.viewer_view)
         self.viewer_view.setFocus()
@@ -72,6 +84,7 @@ class MainWindow(QMainWindow):
     def load_last_session(self):
         last_dir, last_index = load_session()
         if last_dir and last_dir.exists():
+            self._ensure_viewer()
             self.viewer_view.load_directory(last_dir, last_index)
             self.stack.setCurrentWidget(self.viewer_view)
             self.viewer_view.setFocus()
@@ -84,11 +97,14 @@ class MainWindow(QMainWindow):
         self.home_view.setFocus()
 
     def closeEvent(self, event):
-        self.viewer_view.clean_up()
+        if self.viewer_view is not None:
+            self.viewer_view.clean_up()
+        flush_session()
         super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(flush_session)
     window = MainWindow()
 
     if len(sys.argv) > 1 and Path(sys.argv[1]).is_dir():
@@ -1,14 +1,61 @@
-from pathlib import Path
+import os
+from functools import lru_cache
 from PySide6.QtGui import QFontDatabase
 
+from config import HOME
+
+# Font file found by the last directory walk; lets a fresh QApplication
+# re-register it without scanning again (see load_custom_font.cache_clear).
+_font_path: str | None = None
+
+def _register_font(path: str) -> str | None:
+    font_id = QFontDatabase.addApplicationFont(path)
+    if font_id != -1:
+        families = QFontDatabase.applicationFontFamilies(font_id)
+        if families:
+            return families[0]
+    return None
+
+_FONT_EXTS = (".ttf", ".otf", ".ttc")
+
+def _walk_fonts(root: str):
+    """Yield (lowercased name, path) of font files under root, shallowest first.
+
+    Uses the d_type cached by scandir, so no per-entry stat is issued.
+    """
+    pending = [root]
+    while pending:
+        subdirs = []
+        for directory in pending:
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                        name = entry.name.lower()
+                        if name.endswith(_FONT_EXTS):
+                            yield name, entry.path
+            except OSError:
+                continue
+        pending = subdirs
+
+def _find_font_family(root: str) -> str | None:
+    """Register the first Dank Mono file under root and return its family."""
+    global _font_path
+    for name, path in _walk_fonts(root):
+        if "dank" in name and "mono" in name:
+            family = _register_font(path)
+            if family:
+                _font_path = path
+                return family
+    return None
+
+@lru_cache(maxsize=1)
 def load_custom_font() -> str:
-    font_dir = Path.home() / ".local" / "share" / "fonts"
-    if font_dir.exists():
-        for font_file in font_dir.rglob("*"):
-            if "dank" in font_file.name.lower() and "mono" in font_file.name.lower():
-                font_id = QFontDatabase.addApplicationFont(str(font_file))
-                if font_id != -1:
-                    families = QFontDatabase.applicationFontFamilies(font_id)
-                    if families:
-                        return families[0]
-    return "monospace"
+    if _font_path is not None:
+        family = _register_font(_font_path)
+        if family:
+            return family
+    font_dir = HOME / ".local" / "share" / "fonts"
+    return _find_font_family(str(font_dir)) or "monospace"
@@ -1,20 +1,64 @@
+from functools import lru_cache
 from pathlib import Path
-from PySide6.QtCore import Qt, Signal, QUrl
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFileDialog, QApplication
-from PySide6.QtGui import QKeyEvent, QFont, QDesktopServices
+from string import Template
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QApplication
+from PySide6.QtGui import QKeyEvent, QFont
 
-from config import DEFAULT_DIR, CONFIG_FILE
+from config import DEFAULT_DIR, CONFIG_FILE, HOME
+
+_TITLE_TEMPLATE = Template(
+    "<span style='color: $dim'>vim</span>"
+    "<span style='color: $acc'>v</span>"
+    "<span style='color: $dim'>iew</span>"
+)
+
+@lru_cache(maxsize=4)
+def _title_html(dim: str, acc: str) -> str:
+    return _TITLE_TEMPLATE.substitute(dim=dim, acc=acc)
+
+@lru_cache(maxsize=4)
+def _home_stylesheet(accent: str, background: str, text: str) -> str:
+    return f"""
+        QWidget {{ background-color: {background}; }}
+        QLabel#title {{ letter-spacing: 4px; }}
+        QLabel#subtitle {{ color: {accent}; letter-spacing: 2px; }}
+        QLabel#instructions {{
+            background-color: {background}; color: {text};
+            padding: 20px 40px; border: 1px dotted {accent};
+        }}
+    """
 
 class HomeWidget(QWidget):
     open_dir = Signal(Path)
     restore_session = Signal()   # new signal for space key
 
+    _INSTRUCTIONS_HTML = (
+        # "<br>[ 1 ] Customi<br><br>"
+        # "[ o ] select directory<br><br>"
+        # "[ e ] edit config<br><br>"
+        # "[ space ] restore last session<br><br>"
+        # "[ q ] terminate<br>"
+        "<br>~strip the noise. forge the aesthetic.<br><br>"
+        "~load the vision. execute.<br><br>"
+        "~master the system. dictate your environment.<br><br>"
+        "~resurrect the grind. do the work.<br><br>"
+        "~kill the process. keep the discipline.<br>"
+    )
+
     def __init__(self, config: dict, app_font: str):
         super().__init__()
         self.config = config
         self.theme = config["theme"]
         self.app_font = app_font
         self.setFocusPolicy(Qt.StrongFocus)
+        self._key_handlers = {
+            "v": lambda: self.open_dir.emit(DEFAULT_DIR),
+            "o": self._pick_dir,
+            "e": self._edit_config,
+            " ": self.restore_session.emit,
+            "q": QApplication.quit,
+        }
         self._setup_ui()
 
     def _setup_ui(self):
@@ -27,39 +71,21 @@ class HomeWidget(QWidget):
         t_bg = self.theme["background"]
         t_txt = self.theme["text"]
 
-        title = QLabel(
-            f"<span style='color: {t_dim}'>vim</span>"
-            f"<span style='color: {t_acc}'>v</span>"
-            f"<span style='color: {t_dim}'>iew</span>"
-        )
+        title = QLabel(_title_html(t_dim, t_acc))
         title.setFont(QFont(self.app_font, 42, QFont.Bold))
         title.setAlignment(Qt.AlignCenter)
         title.setTextFormat(Qt.RichText)
-        title.setStyleSheet("letter-spacing: 4px;")
+        title.setObjectName("title")
 
         subtitle = QLabel("system ready.")
         subtitle.setFont(QFont(self.app_font, 11))
         subtitle.setAlignment(Qt.AlignCenter)
-        subtitle.setStyleSheet(f"color: {t_acc}; letter-spacing: 2px;")
-
-        instructions = QLabel(
-            # "<br>[ 1 ] Customi<br><br>"
-            # "[ o ] select directory<br><br>"
-            # "[ e ] edit config<br><br>"
-            # "[ space ] restore last session<br><br>"
-            # "[ q ] terminate<br>"
-            "<br>~strip the noise. forge the aesthetic.<br><br>"
-"~load the vision. execute.<br><br>"
-"~master the system. dictate your environment.<br><br>"
-"~resurrect the grind. do the work.<br><br>"
-"~kill the process. keep the discipline.<br>"
-        )
+        subtitle.setObjectName("subtitle")
+
+        instructions = QLabel(self._INSTRUCTIONS_HTML)
         instructions.setFont(QFont(self.app_font, 11, QFont.Bold))
         instructions.setAlignment(Qt.AlignCenter)
-        instructions.setStyleSheet(
-            f"background-color: {t_bg}; color: {t_txt}; "
-            f"padding: 20px 40px; border: 1px dotted {t_acc};"
-        )
+        instructions.setObjectName("instructions")
 
         layout.addWidget(title)
         layout.addWidget(subtitle)
@@ -71,22 +97,30 @@ class HomeWidget(QWidget):
         h_layout.addStretch()
         layout.addLayout(h_layout)
 
-        self.setStyleSheet(f"background-color: {t_bg};")
+        # One sheet for the whole page: a single CSS parse and polish pass.
+        self.setStyleSheet(_home_stylesheet(t_acc, t_bg, t_txt))
+
+    def _pick_dir(self):
+        from PySide6.QtWidgets import QFileDialog  # only needed on demand
+        folder = QFileDialog.getExistingDirectory(
+            self, "select directory", str(HOME),
+            QFileDialog.Options(QFileDialog.DontUseNativeDialog)
+        )
+        if folder:
+            self.open_dir.emit(Path(folder))
+
+    def _edit_config(self):
+        from PySide6.QtCore import QUrl
+        from PySide6.QtGui import QDesktopServices
+        QDesktopServices.openUrl(QUrl.fromLocalFile(str(CONFIG_FILE)))
 
     def keyPressEvent(self, event: QKeyEvent):
-        key = event.text().lower()
-        if key == "v":
-            self.open_dir.emit(DEFAULT_DIR)
-        elif key == "o":
-            folder = QFileDialog.getExistingDirectory(
-                self, "select directory", str(Path.home()),
-                QFileDialog.Options(QFileDialog.DontUseNativeDialog)
-            )
-            if folder:
-                self.open_dir.emit(Path(folder))
-        elif key == "e":
-            QDesktopServices.openUrl(QUrl.fromLocalFile(str(CONFIG_FILE)))
-        elif key == " ":
-            self.restore_session.emit()
-        elif key == "q" or event.key() == Qt.Key_Escape:
+        if event.key() == Qt.Key_Escape:
             QApplication.quit()
+            return
+        text = event.text()
+        handler = self._key_handlers.get(text.lower()) if text else None
+        if handler:
+            handler()
+        else:
+            super().keyPressEvent(event)
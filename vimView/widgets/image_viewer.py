@@ -1,13 +1,18 @@
-import shutil
+import bisect
+import math
+import os
+import threading
+from collections import OrderedDict
 from enum import Enum, auto
+from functools import cached_property, partial
 from pathlib import Path
 
 from PySide6.QtCore import (
     Qt, QSize, QTimer, QPropertyAnimation, QEasingCurve,
-    QEvent, QUrl, Signal, QMimeData
+    QEvent, QUrl, Signal, QMimeData, QThreadPool
 )
 from PySide6.QtGui import (
-    QKeyEvent, QPixmap, QFont, QIcon, QImageReader, QDesktopServices,
+    QKeyEvent, QPixmap, QFont, QIcon, QImageReader, QImageIOHandler, QDesktopServices,
     QTransform, QImage, QClipboard
 )
 from PySide6.QtWidgets import (
@@ -16,8 +21,12 @@ from PySide6.QtWidgets import (
     QApplication
 )
 
-from config import save_config, save_session, CONFIG_FILE
-from workers.thumbnail_worker import ThumbnailWorker
+from config import save_config, save_config_fast, save_session, CONFIG_FILE
+from workers.image_decoder import DecodeJob, DecodeSignals, decode_image
+from workers.thumbnail_worker import ThumbnailWorker, THUMB_SIZE
+from workers.file_ops import FileOp, FileOpSignals
+
+_IMAGE_EXTS = frozenset({".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp"})
 
 class ViewerMode(Enum):
     NORMAL = auto()
@@ -29,29 +38,68 @@ class ViewerMode(Enum):
 class ImageViewerWidget(QWidget):
     go_home = Signal()
 
+    PIXMAP_CACHE_SIZE = 8
+    SCALED_CACHE_BYTES = 128 * 1024 * 1024   # rotated+scaled views besides the one on screen
+    PREFETCH_LIMIT = 2      # neighbour decodes in flight at once
+    THUMB_LOOKAHEAD = 8     # filmstrip rows beyond each edge to thumbnail ahead of scrolling
+
     def __init__(self, config: dict, app_font: str):
         super().__init__()
         self.setFocusPolicy(Qt.StrongFocus)
 
         self.config = config
-        self.keymap = {k: v.lower() for k, v in config["keymap"].items()}
+        self.keymap = config["keymap"]          # lower-cased by load_config
         self.theme = config["theme"]
         self.settings = config["settings"]
         self.folders = {k.lower(): v for k, v in config["quick_folders"].items()}
         self.app_font = app_font
+        self._scaled_cache_budget = 0 if self.settings.get("low_memory") else self.SCALED_CACHE_BYTES
+        self._build_key_dispatch()
 
         self.directory: Path | None = None
         self.all_image_files: list[Path] = []
         self.image_files: list[Path] = []          # filtered list
+        # path -> position lookups kept in step with the two lists above
+        self._idx_in_all: dict[Path, int] = {}
+        self._idx_in_filtered: dict[Path, int] = {}
+        # lowercased names parallel to all_image_files, for search
+        self._lower_names: list[str] = []
+        # str(path) for every listed file; thumb_cache and item data use these
+        self._path_str: dict[Path, str] = {}
         self.thumb_cache: dict[str, QPixmap] = {}
         self.filmstrip_item_map: dict[Path, QListWidgetItem] = {}
+        self._pixmap_lru: OrderedDict[str, tuple[QPixmap, bool]] = OrderedDict()
+        self._rotated_cache: tuple[str, int, QPixmap] | None = None
+        self._scaled_cache: OrderedDict[tuple, QPixmap] = OrderedDict()
+        self._scaled_cache_bytes = 0
+        self._last_scaled_key: tuple | None = None   # inputs of the label's current pixmap
+        self._display_path: str | None = None
+        self._full_res = False      # original_pixmap is not a reduced decode
+        self._full_decode_generation = -1   # generation of a pending full-size decode
+        self._source_size: tuple[str, QSize] | None = None   # full size of a reduced decode
+        self._decode_generation = 0
+        self._decode_cancel = threading.Event()   # set when the pending decode is stale
+        self._prefetching: dict[str, threading.Event] = {}   # path -> cancel flag
+        self._decode_signals = DecodeSignals()
+        self._decode_signals.done.connect(self._on_image_decoded)
+        # displayed-image decodes run one at a time, newest request only;
+        # neighbour prefetches use the global pool
+        self._display_pool = QThreadPool(self)
+        self._display_pool.setMaxThreadCount(1)
 
         self.current_index = 0
         self.rotation_angle = 0
         self.zoom_mode = "fit"      # "fit" or "custom"
         self.zoom_factor = 1.0
-        self.worker: ThumbnailWorker | None = None
+        self.worker = ThumbnailWorker()
+        self.worker.icons_ready.connect(self._apply_thumbnails)
         self.undo_stack: list[dict] = []
+        # renames/moves run here one at a time, in the order they were asked for
+        self._file_pool = QThreadPool(self)
+        self._file_pool.setMaxThreadCount(1)
+        self._file_signals = FileOpSignals()
+        self._file_signals.done.connect(self._on_file_op_done)
+        self._busy_paths: set[Path] = set()
 
         self.mode = ViewerMode.NORMAL
         self.confirm_callback = None
@@ -72,6 +120,12 @@ class ImageViewerWidget(QWidget):
         t_acc = self.theme["accent"]
         t_bord = self.theme["border"]
 
+        # the few fonts the viewer uses, built once
+        self._font_10 = QFont(self.app_font, 10)
+        self._font_11 = QFont(self.app_font, 11)
+        self._font_11_bold = QFont(self.app_font, 11, QFont.Bold)
+        self._font_12 = QFont(self.app_font, 12)
+
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
         self.layout.setSpacing(0)
@@ -87,50 +141,93 @@ class ImageViewerWidget(QWidget):
         self.label.setStyleSheet(f"background-color: {t_bg}; color: {t_txt};")
         self.scroll_area.setWidget(self.label)
 
-        # Top overlay (filename)
-        self.top_overlay = QLabel(self.scroll_area)
-        self.top_overlay.setStyleSheet(
-            f"background-color: rgba(0,0,0,200); color: {t_txt}; "
-            f"padding: 8px 16px; border-bottom: 1px dotted {t_bord};"
+        # Filmstrip
+        self.filmstrip = QListWidget()
+        self.filmstrip.setFlow(QListWidget.LeftToRight)
+        self.filmstrip.setFixedHeight(120)
+        self.filmstrip.setIconSize(QSize(90, 90))
+        self.filmstrip.setSpacing(8)
+        self.filmstrip.setFocusPolicy(Qt.NoFocus)
+        self.filmstrip.setStyleSheet(
+            f"""
+            QListWidget {{
+                background-color: {t_surf};
+                border-top: 1px dashed {t_bord};
+                padding: 10px;
+            }}
+            QListWidget::item {{
+                background-color: {t_bg};
+                border: 1px solid {t_bord};
+            }}
+            QListWidget::item:selected {{
+                background-color: {t_bg};
+                border: 1px solid {t_acc};
+            }}
+            """
+        )
+        self.filmstrip.currentRowChanged.connect(self._on_filmstrip_selected)
+
+        self.layout.addWidget(self.scroll_area)
+        self.layout.addWidget(self.filmstrip)
+
+    # Overlays below are built on first use; most sessions never search or rename.
+    def _visible(self, name: str) -> bool:
+        """isVisible() for a lazily built overlay, without building it."""
+        widget = self.__dict__.get(name)
+        return widget is not None and widget.isVisible()
+
+    @cached_property
+    def top_overlay(self) -> QLabel:
+        top_overlay = QLabel(self.scroll_area)
+        top_overlay.setStyleSheet(
+            f"background-color: rgba(0,0,0,200); color: {self.theme['text']}; "
+            f"padding: 8px 16px; border-bottom: 1px dotted {self.theme['border']};"
         )
-        self.top_overlay.setFont(QFont(self.app_font, 10))
-        self.top_overlay.setAlignment(Qt.AlignCenter)
-        self.top_overlay.hide()
+        top_overlay.setFont(self._font_10)
+        top_overlay.setAlignment(Qt.AlignCenter)
+        top_overlay.hide()
+        return top_overlay
 
-        # Central overlay (notifications / confirmations)
-        self.overlay = QLabel(self.scroll_area)
-        self.overlay.setStyleSheet(
+    @cached_property
+    def overlay(self) -> QLabel:
+        t_acc = self.theme["accent"]
+        overlay = QLabel(self.scroll_area)
+        overlay.setStyleSheet(
             f"background-color: rgba(0,0,0,240); color: {t_acc}; "
             f"padding: 20px 30px; border: 1px dotted {t_acc};"
         )
-        self.overlay.setFont(QFont(self.app_font, 11, QFont.Bold))
-        self.overlay.setAlignment(Qt.AlignCenter)
-        self.overlay.hide()
+        overlay.setFont(self._font_11_bold)
+        overlay.setAlignment(Qt.AlignCenter)
+        overlay.hide()
 
-        self.opacity_effect = QGraphicsOpacityEffect(self.overlay)
-        self.overlay.setGraphicsEffect(self.opacity_effect)
+        self.opacity_effect = QGraphicsOpacityEffect(overlay)
+        overlay.setGraphicsEffect(self.opacity_effect)
         self.anim = QPropertyAnimation(self.opacity_effect, b"opacity")
         self.anim.setDuration(150)
         self.anim.setStartValue(0)
         self.anim.setEndValue(1)
         self.anim.setEasingCurve(QEasingCurve.OutQuad)
+        return overlay
 
-        # Input container (rename / search)
-        self.input_container = QWidget(self.scroll_area)
-        self.input_container.setStyleSheet(
+    @cached_property
+    def input_container(self) -> QWidget:
+        """Rename / search box; also creates input_prompt and text_input."""
+        t_acc = self.theme["accent"]
+        input_container = QWidget(self.scroll_area)
+        input_container.setStyleSheet(
             f"background-color: rgba(0,0,0,240); border: 1px solid {t_acc}; padding: 10px;"
         )
-        input_layout = QVBoxLayout(self.input_container)
+        input_layout = QVBoxLayout(input_container)
 
         self.input_prompt = QLabel()
-        self.input_prompt.setFont(QFont(self.app_font, 11, QFont.Bold))
+        self.input_prompt.setFont(self._font_11_bold)
         self.input_prompt.setStyleSheet(f"color: {t_acc}; border: none;")
 
         self.text_input = QLineEdit()
-        self.text_input.setFont(QFont(self.app_font, 11))
+        self.text_input.setFont(self._font_11)
         self.text_input.setStyleSheet(
-            f"background-color: {t_bg}; color: {t_txt}; "
-            f"border: 1px dotted {t_bord}; padding: 5px;"
+            f"background-color: {self.theme['background']}; color: {self.theme['text']}; "
+            f"border: 1px dotted {self.theme['border']}; padding: 5px;"
         )
         self.text_input.returnPressed.connect(self._process_text_input)
         self.text_input.installEventFilter(self)
@@ -138,57 +235,32 @@ class ImageViewerWidget(QWidget):
 
         input_layout.addWidget(self.input_prompt)
         input_layout.addWidget(self.text_input)
-        self.input_container.hide()
+        input_container.hide()
+        return input_container
 
-        # Suggestion list (for search)
-        self.suggestion_list = QListWidget(self.scroll_area)
-        self.suggestion_list.setIconSize(QSize(36, 36))
-        self.suggestion_list.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.suggestion_list.setStyleSheet(
+    @cached_property
+    def suggestion_list(self) -> QListWidget:
+        t_acc = self.theme["accent"]
+        suggestion_list = QListWidget(self.scroll_area)
+        suggestion_list.setIconSize(QSize(36, 36))
+        suggestion_list.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        suggestion_list.setStyleSheet(
             f"""
             QListWidget {{
                 background-color: rgba(0,0,0,240);
                 border: 1px solid {t_acc};
                 border-top: none;
-                color: {t_txt};
+                color: {self.theme['text']};
                 font-family: "{self.app_font}";
                 font-size: 10pt;
             }}
-            QListWidget::item {{ padding: 5px; border-bottom: 1px dotted {t_bord}; }}
+            QListWidget::item {{ padding: 5px; border-bottom: 1px dotted {self.theme['border']}; }}
             QListWidget::item:selected {{ background-color: {t_acc}; color: #000000; }}
             """
         )
-        self.suggestion_list.hide()
-        self.suggestion_list.itemActivated.connect(self._on_suggestion_activated)
-
-        # Filmstrip
-        self.filmstrip = QListWidget()
-        self.filmstrip.setFlow(QListWidget.LeftToRight)
-        self.filmstrip.setFixedHeight(120)
-        self.filmstrip.setIconSize(QSize(90, 90))
-        self.filmstrip.setSpacing(8)
-        self.filmstrip.setFocusPolicy(Qt.NoFocus)
-        self.filmstrip.setStyleSheet(
-            f"""
-            QListWidget {{
-                background-color: {t_surf};
-                border-top: 1px dashed {t_bord};
-                padding: 10px;
-            }}
-            QListWidget::item {{
-                background-color: {t_bg};
-                border: 1px solid {t_bord};
-            }}
-            QListWidget::item:selected {{
-                background-color: {t_bg};
-                border: 1px solid {t_acc};
-            }}
-            """
-        )
-        self.filmstrip.currentRowChanged.connect(self._on_filmstrip_selected)
-
-        self.layout.addWidget(self.scroll_area)
-        self.layout.addWidget(self.filmstrip)
+        suggestion_list.hide()
+        suggestion_list.itemActivated.connect(self._on_suggestion_activated)
+        return suggestion_list
 
     def _setup_timers(self):
         self.overlay_timer = QTimer(self)
@@ -199,13 +271,54 @@ class ImageViewerWidget(QWidget):
         self.filename_timer.setSingleShot(True)
         self.filename_timer.timeout.connect(self._hide_filename_overlay)
 
+        # coalesces suggestion lookups while typing
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(80)
+        self._search_timer.timeout.connect(self._run_search)
+        self._pending_search = ""
+
+        # coalesces held-down navigation keys into one image update per tick
+        self._nav_timer = QTimer(self)
+        self._nav_timer.setSingleShot(True)
+        self._nav_timer.setInterval(15)
+        self._nav_timer.timeout.connect(self._update_image)
+
+        # coalesces bursts of settings toggles into one config write
+        self._config_timer = QTimer(self)
+        self._config_timer.setSingleShot(True)
+        self._config_timer.setInterval(500)
+        self._config_timer.timeout.connect(self._flush_config)
+        self._config_flush_pending = False
+        self._config_compact = False   # the file holds a save_config_fast write
+
+        # asks for the thumbnails around the filmstrip viewport once scrolling settles
+        self._thumb_timer = QTimer(self)
+        self._thumb_timer.setSingleShot(True)
+        self._thumb_timer.setInterval(30)
+        self._thumb_timer.timeout.connect(self._request_visible_thumbnails)
+        scrollbar = self.filmstrip.horizontalScrollBar()
+        scrollbar.valueChanged.connect(self._schedule_thumbnails)
+        scrollbar.rangeChanged.connect(self._schedule_thumbnails)
+
     # ----------------------------------------------------------------------
     # Directory loading
     # ----------------------------------------------------------------------
     def load_directory(self, directory: Path, initial_index: int = 0):
-        self.directory = Path(directory).resolve()
+        directory = Path(directory).resolve()
+        if directory != self.directory:
+            # thumbnails stay valid when the same directory is reopened
+            self.thumb_cache.clear()
+            self.filmstrip.clear()
+            self.filmstrip_item_map.clear()
+            self.worker.stop()
+        self.directory = directory
         self.undo_stack.clear()
-        self.thumb_cache.clear()
+        self._pixmap_lru.clear()
+        self._scaled_cache.clear()
+        self._scaled_cache_bytes = 0
+        self._cancel_prefetch()
+        self._rotated_cache = None
         self.is_search_filtered = False
         self.pre_search_path = None
 
@@ -213,6 +326,9 @@ class ImageViewerWidget(QWidget):
         self.trash_dir.mkdir(exist_ok=True)
 
         self.all_image_files = self._get_images()
+        self._idx_in_all = {p: i for i, p in enumerate(self.all_image_files)}
+        self._lower_names = [p.name.lower() for p in self.all_image_files]
+        self._path_str = {p: str(p) for p in self.all_image_files}
         self.image_files = list(self.all_image_files)
 
         if self.image_files:
@@ -228,63 +344,130 @@ class ImageViewerWidget(QWidget):
         self._rebuild_filmstrip_and_thumbnails()
 
     def _get_images(self) -> list[Path]:
-        exts = {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp"}
-        if not self.directory or not self.directory.is_dir():
+        if not self.directory:
             return []
-        return sorted(
-            p for p in self.directory.iterdir()
-            if p.suffix.lower() in exts and not p.name.startswith(".")
-        )
+        try:
+            with os.scandir(self.directory) as it:
+                names = [
+                    e.name for e in it
+                    if not e.name.startswith(".")
+                    and e.name[e.name.rfind("."):].lower() in _IMAGE_EXTS
+                    and e.is_file()
+                ]
+        except OSError:
+            return []
+        names.sort()
+        return [self.directory / name for name in names]
 
     # ----------------------------------------------------------------------
     # Filmstrip & thumbnails
     # ----------------------------------------------------------------------
     def _rebuild_filmstrip_and_thumbnails(self):
-        # Stop previous worker
-        if self.worker:
-            self.worker.stop()
-            self.worker.wait()
-
-        self.filmstrip.clear()
-        self.filmstrip_item_map.clear()
-
-        # Create empty items
-        for img_path in self.image_files:
-            item = QListWidgetItem()
-            item.setData(Qt.UserRole, str(img_path))
-            self.filmstrip.addItem(item)
-            self.filmstrip_item_map[img_path] = item
+        """Bring the filmstrip in line with image_files, reusing existing items."""
+        self._idx_in_filtered = {p: i for i, p in enumerate(self.image_files)}
+        item_map = self.filmstrip_item_map
+        self.filmstrip.blockSignals(True)
+        self.filmstrip.setUpdatesEnabled(False)
+
+        # Drop items no longer shown, walking backwards so rows stay valid
+        for row in range(self.filmstrip.count() - 1, -1, -1):
+            path = Path(self.filmstrip.item(row).data(Qt.UserRole))
+            if path not in self._idx_in_filtered:
+                self.filmstrip.takeItem(row)
+                item_map.pop(path, None)
+
+        # Insert new items and move any that are out of place
+        for i, img_path in enumerate(self.image_files):
+            path_s = self._path_str[img_path]
+            pix = self.thumb_cache.get(path_s)
+            item = item_map.get(img_path)
+            if item is None:
+                item = QListWidgetItem()
+                item.setData(Qt.UserRole, path_s)
+                if pix is not None:
+                    item.setIcon(QIcon(pix))
+                self.filmstrip.insertItem(i, item)
+                item_map[img_path] = item
+            else:
+                if pix is not None and item.icon().isNull():
+                    item.setIcon(QIcon(pix))
+                if self.filmstrip.item(i) is not item:
+                    self.filmstrip.takeItem(self.filmstrip.row(item))
+                    self.filmstrip.insertItem(i, item)
 
+        self.filmstrip.setUpdatesEnabled(True)
+        self.filmstrip.blockSignals(False)
         self._update_image()
+        self._schedule_thumbnails()
 
-        # Start loading thumbnails
-        if self.image_files:
-            self.worker = ThumbnailWorker(self.image_files)
-            self.worker.icon_ready.connect(self._apply_thumbnail)
-            self.worker.start()
-
-    def _apply_thumbnail(self, path_str: str, pixmap: QPixmap):
-        path = Path(path_str)
-        # Only apply if the path is still in the current map
-        item = self.filmstrip_item_map.get(path)
-        if item is not None:
-            item.setIcon(QIcon(pixmap))
+    def _schedule_thumbnails(self, *_):
+        self._thumb_timer.start()
+
+    def _request_visible_thumbnails(self):
+        """Queue missing thumbnails for the visible filmstrip rows, centre first."""
+        strip = self.filmstrip
+        count = strip.count()
+        if not count or not strip.isVisible():
+            return
+        # Rows run left to right, so the on-screen ones are found by bisecting
+        # on their geometry; rows still without a thumbnail are only a couple
+        # of pixels wide, so neither a fixed row width nor indexAt will do.
+        rows = range(count)
+        width = strip.viewport().width()
+
+        def rect(row):
+            return strip.visualItemRect(strip.item(row))
+
+        first = bisect.bisect_left(rows, True, key=lambda row: rect(row).right() >= 0)
+        end = bisect.bisect_left(rows, True, key=lambda row: rect(row).left() > width)
+        if first >= end:
+            return
+        centre = (first + end - 1) // 2
+        wanted = []
+        for row in range(max(0, first - self.THUMB_LOOKAHEAD), min(count, end + self.THUMB_LOOKAHEAD)):
+            path_s = strip.item(row).data(Qt.UserRole)
+            if path_s not in self.thumb_cache:
+                wanted.append((abs(row - centre), path_s))
+        self.worker.request(wanted)
+
+    def _apply_thumbnails(self, batch: list):
+        self.filmstrip.setUpdatesEnabled(False)
+        prefix = str(self.directory)
+        for path_str, img in batch:
+            # Ignore results for files outside the current directory listing
+            if not path_str.startswith(prefix):
+                continue
+            path = Path(path_str)
+            if path not in self._idx_in_all:
+                continue
+            pixmap = QPixmap.fromImage(img)
             self.thumb_cache[path_str] = pixmap
+            item = self.filmstrip_item_map.get(path)
+            if item is not None:
+                item.setIcon(QIcon(pixmap))
+        self.filmstrip.setUpdatesEnabled(True)
 
     # ----------------------------------------------------------------------
     # Image display
     # ----------------------------------------------------------------------
+    def _schedule_update(self):
+        if not self._nav_timer.isActive():
+            self._nav_timer.start()
+
     def _update_image(self):
+        self._nav_timer.stop()
+        self._last_scaled_key = None
         self.rotation_angle = 0
         self.zoom_mode = "fit"
         self.zoom_factor = 1.0
 
         if not self.image_files:
             self.label.setText("no images found")
-            self.label.setFont(QFont(self.app_font, 12))
+            self.label.setFont(self._font_12)
             self.window().setWindowTitle("vimview - empty")
             self.filmstrip.hide()
             self.original_pixmap = None
+            self._display_path = None
             return
 
         if not self.filmstrip.isHidden():
@@ -293,8 +476,27 @@ class ImageViewerWidget(QWidget):
         self.current_index = max(0, min(self.current_index, len(self.image_files) - 1))
         img_path = self.image_files[self.current_index]
 
-        self.original_pixmap = QPixmap(str(img_path))
-        self._refresh_pixmap_scale()
+        self._display_path = self._path_str[img_path]
+        self._decode_generation += 1
+        # the previous target is stale now: drop its job if it hasn't
+        # started, and let it bail out early if it has
+        self._decode_cancel.set()
+        self._decode_cancel = threading.Event()
+        self._display_pool.clear()
+        entry = self._cached_pixmap(self._display_path)
+        if entry is not None:
+            self.original_pixmap, self._full_res = entry
+            self._refresh_pixmap_scale()
+            self._prefetch_neighbours()
+        elif self._display_path in self._prefetching:
+            # a neighbour prefetch is already decoding it; show that result
+            self.original_pixmap = None
+            self._full_res = False
+        else:
+            # keep showing the previous image until the decode lands
+            self.original_pixmap = None
+            self._full_res = False
+            self._start_display_decode()
 
         # Update filmstrip selection
         self.filmstrip.blockSignals(True)
@@ -307,23 +509,209 @@ class ImageViewerWidget(QWidget):
         self._update_title()
         self._trigger_filename_overlay(img_path.name)
 
+    def _start_display_decode(self, max_side: int | None = None):
+        if max_side is None:
+            max_side = self._fit_decode_size()
+        self._display_pool.start(DecodeJob(
+            self._decode_signals, self._display_path,
+            self._decode_generation, max_side, self._decode_cancel
+        ))
+
+    def _fit_decode_size(self) -> int:
+        # Square box with 2x headroom, so EXIF orientation does not matter
+        # and small zoom steps do not need a re-decode.
+        vp = self.scroll_area.viewport().size()
+        return 2 * max(vp.width(), vp.height())
+
+    def _covers_viewport(self, pixmap: QPixmap, full: bool) -> bool:
+        """Whether a decode can be fitted to the viewport without upscaling."""
+        if full:
+            return True
+        vp = self.scroll_area.viewport().size()
+        return max(pixmap.width(), pixmap.height()) >= max(vp.width(), vp.height())
+
+    def _cached_pixmap(self, path_str: str, full: bool = False) -> tuple[QPixmap, bool] | None:
+        """Look up recent decodes; reduced ones only serve fit mode while they cover the viewport."""
+        entry = self._pixmap_lru.get(path_str)
+        if entry is None or (full and not entry[1]) or not self._covers_viewport(*entry):
+            return None
+        self._pixmap_lru.move_to_end(path_str)
+        return entry
+
+    def _cache_pixmap(self, path_str: str, pixmap: QPixmap, full: bool):
+        self._pixmap_lru[path_str] = (pixmap, full)
+        self._pixmap_lru.move_to_end(path_str)
+        if len(self._pixmap_lru) > self.PIXMAP_CACHE_SIZE:
+            self._pixmap_lru.popitem(last=False)
+
+    def _on_image_decoded(self, path_str: str, generation: int, image: QImage, full: bool):
+        pixmap = QPixmap.fromImage(image)
+        self._cache_pixmap(path_str, pixmap, full)
+        if generation < 0:
+            # prefetches only count if the user has already arrived there
+            self._prefetching.pop(path_str, None)
+            if self.original_pixmap is not None:
+                return
+        elif generation != self._decode_generation:
+            return
+        if path_str != self._display_path:
+            return
+        self.original_pixmap, self._full_res = pixmap, full
+        self._rotated_cache = None
+        self._refresh_pixmap_scale()
+        # the viewport may have grown while this was decoding
+        if self.zoom_mode == "fit":
+            self._ensure_fit_resolution()
+        self._prefetch_neighbours()
+
+    def _prefetch_neighbours(self):
+        """Warm the pixmap LRU with the images either side of the current one."""
+        if self.zoom_mode != "fit":
+            return
+        i = self.current_index
+        window = {self._path_str[p] for p in self.image_files[max(0, i - 2):i + 3]}
+        for path_str in [p for p in self._prefetching if p not in window]:
+            self._prefetching.pop(path_str).set()
+
+        for j in (i + 1, i - 1):
+            if len(self._prefetching) >= self.PREFETCH_LIMIT:
+                break
+            if not 0 <= j < len(self.image_files):
+                continue
+            path_str = self._path_str[self.image_files[j]]
+            entry = self._pixmap_lru.get(path_str)
+            if path_str in self._prefetching or (entry and self._covers_viewport(*entry)):
+                continue
+            cancel = threading.Event()
+            self._prefetching[path_str] = cancel
+            QThreadPool.globalInstance().start(DecodeJob(
+                self._decode_signals, path_str, -1, self._fit_decode_size(), cancel
+            ), -1)
+
+    def _cancel_prefetch(self):
+        for cancel in self._prefetching.values():
+            cancel.set()
+        self._prefetching.clear()
+
+    def _ensure_fit_resolution(self):
+        """Re-decode a reduced image that the viewport has outgrown."""
+        if (self.original_pixmap is None or self._display_path is None
+                or self._covers_viewport(self.original_pixmap, self._full_res)):
+            return
+        # keep showing the smaller decode until the new one lands
+        self._decode_generation += 1
+        self._decode_cancel.set()
+        self._decode_cancel = threading.Event()
+        self._display_pool.clear()
+        self._start_display_decode()
+
+    def _full_size(self) -> QSize:
+        """Size of the displayed image at full resolution, EXIF rotation applied."""
+        if self._full_res:
+            return self.original_pixmap.size()
+        if self._source_size is None or self._source_size[0] != self._display_path:
+            # header only, so cheap enough for the GUI thread
+            reader = QImageReader(self._display_path)
+            reader.setAutoTransform(True)
+            size = reader.size()
+            if reader.transformation() & QImageIOHandler.TransformationRotate90:
+                size.transpose()
+            if not size.isValid():
+                size = self.original_pixmap.size()
+            self._source_size = (self._display_path, size)
+        return self._source_size[1]
+
+    def _request_full_resolution(self):
+        """Decode the full-size image in the background if custom zoom outgrows
+        the reduced one; until it lands the reduced one is scaled up instead."""
+        if self._full_res or self._display_path is None:
+            return
+        if self.original_pixmap is not None:
+            pm, full = self.original_pixmap, self._full_size()
+            if max(pm.width(), pm.height()) >= max(full.width(), full.height()) * self.zoom_factor:
+                return
+        entry = self._cached_pixmap(self._display_path, full=True)
+        if entry is not None:
+            self.original_pixmap, self._full_res = entry
+            self._rotated_cache = None
+            return
+        if self._full_decode_generation == self._decode_generation:
+            return   # already on its way
+        # replaces any pending fit decode, which would be too small anyway
+        self._decode_generation += 1
+        self._full_decode_generation = self._decode_generation
+        self._decode_cancel.set()
+        self._decode_cancel = threading.Event()
+        self._display_pool.clear()
+        self._start_display_decode(max_side=0)
+
+    def _forget_pixmap(self, path: Path):
+        """Drop cached decodes of a file that was renamed, moved or trashed."""
+        path_str = str(path)
+        self._pixmap_lru.pop(path_str, None)
+        if self._rotated_cache and self._rotated_cache[0] == path_str:
+            self._rotated_cache = None
+
     def _refresh_pixmap_scale(self):
         if not self.original_pixmap or self.original_pixmap.isNull():
             return
 
-        transform = QTransform().rotate(self.rotation_angle)
-        rotated = self.original_pixmap.transformed(transform, Qt.SmoothTransformation)
+        vp = self.scroll_area.viewport().size()
+        key = (vp.width(), vp.height(), self.rotation_angle, self.zoom_factor,
+               self.zoom_mode, self.original_pixmap.cacheKey())
+        if key == self._last_scaled_key:
+            return
 
+        angle = self.rotation_angle % 360
         if self.zoom_mode == "fit":
-            target = self.scroll_area.viewport().size()
-            scaled = rotated.scaled(target, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.label.setFixedSize(scaled.size())
-            self.label.setPixmap(scaled)
+            scale_key = (vp.width(), vp.height())
+        else:
+            # zoom steps are powers of 1.25, so this is an exact step count
+            scale_key = round(math.log(self.zoom_factor, 1.25))
+        cache_key = (self.original_pixmap.cacheKey(), angle, self.zoom_mode, scale_key)
+        scaled = self._scaled_cache.get(cache_key)
+        if scaled is not None:
+            self._scaled_cache.move_to_end(cache_key)
         else:
-            target = rotated.size() * self.zoom_factor
-            scaled = rotated.scaled(target, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.label.setFixedSize(target)
-            self.label.setPixmap(scaled)
+            scaled = self._scale_pixmap(self._rotated_pixmap(angle), vp)
+            self._scaled_cache[cache_key] = scaled
+            self._scaled_cache_bytes += self._pixmap_bytes(scaled)
+            # the newest entry is on screen and always stays; custom zoom
+            # entries of large photos can each run to hundreds of MB
+            while (len(self._scaled_cache) > 1
+                   and self._scaled_cache_bytes > self._scaled_cache_budget):
+                _, evicted = self._scaled_cache.popitem(last=False)
+                self._scaled_cache_bytes -= self._pixmap_bytes(evicted)
+
+        self.label.setFixedSize(scaled.size())
+        self.label.setPixmap(scaled)
+        self._last_scaled_key = key
+
+    @staticmethod
+    def _pixmap_bytes(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def _rotated_pixmap(self, angle: int) -> QPixmap:
+        if angle == 0:
+            return self.original_pixmap
+        cached = self._rotated_cache
+        if cached and cached[0] == self._display_path and cached[1] == angle:
+            return cached[2]
+        # quarter turns map pixels exactly, so skip the filtering pass
+        mode = Qt.FastTransformation if angle % 90 == 0 else Qt.SmoothTransformation
+        rotated = self.original_pixmap.transformed(QTransform().rotate(angle), mode)
+        self._rotated_cache = (self._display_path, angle, rotated)
+        return rotated
+
+    def _scale_pixmap(self, rotated: QPixmap, viewport: QSize) -> QPixmap:
+        if self.zoom_mode == "fit":
+            return rotated.scaled(viewport, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        # zoom is relative to the full-size image, even while a reduced one stands in
+        target = self._full_size() * self.zoom_factor
+        if self.rotation_angle % 180:
+            target.transpose()
+        # target already has the image's aspect; keeping it again only adds rounding
+        return rotated.scaled(target, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
 
     def _update_title(self, status: str = ""):
         if not self.image_files:
@@ -369,18 +757,18 @@ class ImageViewerWidget(QWidget):
             self.mode = ViewerMode.NORMAL
 
     def _position_overlays(self):
-        if self.top_overlay.isVisible():
+        if self._visible("top_overlay"):
             x = (self.scroll_area.width() - self.top_overlay.width()) // 2
             self.top_overlay.move(x, 0)
-        if self.overlay.isVisible():
+        if self._visible("overlay"):
             x = (self.scroll_area.width() - self.overlay.width()) // 2
             y = (self.scroll_area.height() - self.overlay.height()) // 2
             self.overlay.move(x, y)
-        if self.input_container.isVisible():
+        if self._visible("input_container"):
             x = (self.scroll_area.width() - self.input_container.width()) // 2
             y = (self.scroll_area.height() - self.input_container.height()) // 2
             self.input_container.move(x, y)
-        if self.suggestion_list.isVisible():
+        if self._visible("suggestion_list"):
             self.suggestion_list.move(
                 self.input_container.x(),
                 self.input_container.y() + self.input_container.height()
@@ -390,6 +778,12 @@ class ImageViewerWidget(QWidget):
     # Actions (copy, delete, rename, move, undo, search)
     # ----------------------------------------------------------------------
     def _handle_action_request(self, prompt: str, callback, success_msg: str):
+        """Run callback(success_msg), after confirmation if that is enabled.
+
+        The callback queues a file operation, which shows success_msg once it
+        has actually completed.
+        """
+        callback = partial(callback, success_msg)
         if self.settings.get("require_confirmation", False):
             self.mode = ViewerMode.CONFIRM
             self.confirm_callback = callback
@@ -398,7 +792,6 @@ class ImageViewerWidget(QWidget):
             self._update_title("awaiting confirmation")
         else:
             callback()
-            self.show_animated_overlay(success_msg)
 
     def _clipboard_action(self, action_type: str):
         if not self.image_files:
@@ -414,7 +807,11 @@ class ImageViewerWidget(QWidget):
         url = QUrl.fromLocalFile(str(img_path))
         mime = QMimeData()
         mime.setUrls([url])
-        mime.setImageData(QImage(str(img_path)))
+        # reuse the displayed decode unless it is a reduced fit-mode one
+        if self.original_pixmap is not None and self._full_res:
+            mime.setImageData(self.original_pixmap.toImage())
+        else:
+            mime.setImageData(decode_image(self._path_str[img_path])[0])
 
         gnome_format = b"copy\n" if action_type == "copy" else b"cut\n"
         gnome_format += url.toString().encode("utf-8")
@@ -424,8 +821,10 @@ class ImageViewerWidget(QWidget):
         self.show_animated_overlay(f"{action_type} to clipboard")
 
     def _open_text_input(self, mode: ViewerMode):
+        container = self.input_container   # also builds input_prompt / text_input
         self.mode = mode
-        self.overlay.hide()
+        if self._visible("overlay"):
+            self.overlay.hide()
 
         if mode == ViewerMode.RENAME:
             self.input_prompt.setText("new file name:")
@@ -438,15 +837,16 @@ class ImageViewerWidget(QWidget):
             self.text_input.clear()
 
         self.text_input.selectAll()
-        self.input_container.adjustSize()
+        container.adjustSize()
         self._position_overlays()
-        self.input_container.show()
+        container.show()
         self.text_input.setFocus()
 
     def _process_text_input(self):
         text = self.text_input.text().strip()
         mode = self.mode
         self.input_container.hide()
+        self._search_timer.stop()
         self.suggestion_list.hide()
         self.setFocus()
         self.mode = ViewerMode.NORMAL
@@ -454,7 +854,7 @@ class ImageViewerWidget(QWidget):
         if mode == ViewerMode.RENAME and text:
             self._handle_action_request(
                 f"rename to '{text}'?",
-                lambda: self._rename_current_file(text),
+                partial(self._rename_current_file, text),
                 f"renamed: {text}"
             )
         elif mode == ViewerMode.SEARCH:
@@ -464,7 +864,7 @@ class ImageViewerWidget(QWidget):
             elif not text:
                 self._clear_search_filter()
             else:
-                matches = [f for f in self.all_image_files if text.lower() in f.name.lower()]
+                matches = self._search_matches(text.lower())
                 if not matches:
                     self.show_animated_overlay("no matches found")
                     return
@@ -474,34 +874,55 @@ class ImageViewerWidget(QWidget):
                 self._rebuild_filmstrip_and_thumbnails()
                 self.show_animated_overlay(f"filtered: {len(matches)} images")
 
+    def _search_matches(self, text: str, limit: int = 0) -> list[Path]:
+        """Files whose lowercased name contains text, stopping after limit (0 = all)."""
+        files = self.all_image_files
+        matches = []
+        for i, name in enumerate(self._lower_names):
+            if text in name:
+                matches.append(files[i])
+                if len(matches) == limit:
+                    break
+        return matches
+
     def _on_search_text_changed(self, text: str):
         if self.mode != ViewerMode.SEARCH:
             return
-        text = text.strip().lower()
+        self._pending_search = text
+        self._search_timer.start()
+
+    def _run_search(self):
+        if self.mode != ViewerMode.SEARCH:
+            return
+        text = self._pending_search.strip().lower()
         if not text:
             self.suggestion_list.hide()
             return
 
-        matches = [f for f in self.all_image_files if text in f.name.lower()][:6]
+        matches = self._search_matches(text, limit=6)
         if not matches:
             self.suggestion_list.hide()
             return
 
         self.suggestion_list.clear()
         for f in matches:
+            f_s = self._path_str[f]
             item = QListWidgetItem(f.name)
-            item.setData(Qt.UserRole, str(f))
-            if str(f) in self.thumb_cache:
-                item.setIcon(QIcon(self.thumb_cache[str(f)]))
-            else:
-                # quick thumbnail for suggestion
-                reader = QImageReader(str(f))
-                reader.setScaledSize(QSize(40, 40))
+            item.setData(Qt.UserRole, f_s)
+            if f_s not in self.thumb_cache:
+                # quick thumbnail for suggestion, shaped like the worker's
+                # since it goes into thumb_cache and the filmstrip too
+                reader = QImageReader(f_s)
+                reader.setAutoTransform(True)
+                src = reader.size()
+                if src.isValid():
+                    reader.setScaledSize(src.scaled(THUMB_SIZE, THUMB_SIZE, Qt.KeepAspectRatio))
                 img = reader.read()
                 if not img.isNull():
-                    pix = QPixmap.fromImage(img)
-                    self.thumb_cache[str(f)] = pix
-                    item.setIcon(QIcon(pix))
+                    self._apply_thumbnails([(f_s, img)])
+            pix = self.thumb_cache.get(f_s)
+            if pix is not None:
+                item.setIcon(QIcon(pix))
             self.suggestion_list.addItem(item)
 
         self.suggestion_list.setCurrentRow(-1)
@@ -515,6 +936,7 @@ class ImageViewerWidget(QWidget):
     def _on_suggestion_activated(self, item: QListWidgetItem):
         path_str = item.data(Qt.UserRole)
         self.input_container.hide()
+        self._search_timer.stop()
         self.suggestion_list.hide()
         self.setFocus()
         self._jump_to_image(Path(path_str))
@@ -525,8 +947,9 @@ class ImageViewerWidget(QWidget):
             self.is_search_filtered = False
             self._rebuild_filmstrip_and_thumbnails()
 
-        if target in self.image_files:
-            self.current_index = self.image_files.index(target)
+        index = self._idx_in_filtered.get(target)
+        if index is not None:
+            self.current_index = index
             self._update_image()
             self.show_animated_overlay(f"jumped to:\n{target.name}")
 
@@ -536,8 +959,10 @@ class ImageViewerWidget(QWidget):
         self.image_files = list(self.all_image_files)
         self.is_search_filtered = False
 
-        if self.pre_search_path and self.pre_search_path in self.image_files:
-            self.current_index = self.image_files.index(self.pre_search_path)
+        # image_files is all_image_files again, so its index map applies
+        index = self._idx_in_all.get(self.pre_search_path)
+        if index is not None:
+            self.current_index = index
             self.pre_search_path = None
         else:
             self.current_index = 0
@@ -549,97 +974,127 @@ class ImageViewerWidget(QWidget):
     # ----------------------------------------------------------------------
     # File operations
     # ----------------------------------------------------------------------
-    def _rename_current_file(self, new_name: str):
+    def _rename_current_file(self, new_name: str, success_msg: str = ""):
         img_path = self.image_files[self.current_index]
         if not Path(new_name).suffix:
             new_name += img_path.suffix
-        new_path = img_path.parent / new_name
+        self._start_file_op({
+            "action": "rename_inplace",
+            "old_path": img_path,
+            "new_path": img_path.parent / new_name,
+            "message": success_msg,
+        })
+
+    def _move_to_target(self, target_folder: Path, success_msg: str = ""):
+        img_path = self.image_files[self.current_index]
+        self._start_file_op({
+            "action": "move",
+            "old_path": img_path,
+            "new_path": target_folder / img_path.name,
+            "message": success_msg,
+        })
+
+    def _delete_current(self, success_msg: str = ""):
+        img_path = self.image_files[self.current_index]
+        self._start_file_op({
+            "action": "delete",
+            "old_path": img_path,
+            "trash_path": self.trash_dir / img_path.name,
+            "message": success_msg,
+        })
+
+    def _start_file_op(self, action: dict, undo: bool = False) -> bool:
+        """Queue a file operation; lists are updated in _on_file_op_done.
+
+        Returns False, with a notice, if the file already has one pending.
+        """
+        busy = action["old_path"] if not undo else action.get("new_path", action.get("trash_path"))
+        if busy in self._busy_paths:
+            self.show_animated_overlay("busy: file operation pending")
+            return False
+        self._busy_paths.add(busy)
+        action["busy"] = busy
+        self._file_pool.start(FileOp(self._file_signals, action, undo))
+        return True
+
+    def _on_file_op_done(self, action: dict, undo: bool, error: str):
+        self._busy_paths.discard(action.pop("busy", None))
+        if action["old_path"].parent != self.directory:
+            return   # finished after the viewer moved on to another directory
+        if error:
+            verb = "undo" if undo else {
+                "rename_inplace": "rename", "move": "move", "delete": "trash"
+            }[action["action"]]
+            print(f"failed to {verb}: {error}")
+            self.show_animated_overlay(f"error: {error}" if "exists" in error else f"{verb} failed")
+            return
 
-        if new_path.exists():
-            self.show_animated_overlay("error: file exists")
+        if undo:
+            self._apply_undo(action)
             return
 
-        try:
-            img_path.rename(new_path)
-
-            # Update lists
-            self.image_files[self.current_index] = new_path
-            if img_path in self.all_image_files:
-                idx = self.all_image_files.index(img_path)
-                self.all_image_files[idx] = new_path
-
-            # Update filmstrip item
-            item = self.filmstrip.item(self.current_index)
-            item.setData(Qt.UserRole, str(new_path))
-            self.filmstrip_item_map.pop(img_path, None)
-            self.filmstrip_item_map[new_path] = item
-
-            # Update thumbnail cache
-            if str(img_path) in self.thumb_cache:
-                self.thumb_cache[str(new_path)] = self.thumb_cache.pop(str(img_path))
-
-            self.undo_stack.append({
-                "action": "rename_inplace",
-                "old_path": img_path,
-                "new_path": new_path,
-                "index": self.current_index
-            })
+        img_path = action["old_path"]
+        self._forget_pixmap(img_path)
+        if action["action"] == "rename_inplace":
+            self._replace_path(img_path, action["new_path"])
+            self.undo_stack.append(action)
             self._update_image()
-        except Exception as e:
-            print(f"failed to rename: {e}")
-
-    def _move_to_target(self, target_folder: Path):
-        img_path = self.image_files[self.current_index]
-        target_folder.mkdir(parents=True, exist_ok=True)
-
-        new_path = target_folder / img_path.name
-        counter = 1
-        while new_path.exists():
-            new_path = target_folder / f"{img_path.stem}_{counter}{img_path.suffix}"
-            counter += 1
-
-        try:
-            shutil.move(str(img_path), str(new_path))
-            self.undo_stack.append({
-                "action": "move",
-                "old_path": img_path,
-                "new_path": new_path,
-                "index": self.current_index
-            })
-            self._remove_item_from_view(self.current_index)
-        except Exception as e:
-            print(f"failed to move: {e}")
-
-    def _delete_current(self):
-        img_path = self.image_files[self.current_index]
-        trash_path = self.trash_dir / img_path.name
-
-        # handle name collision in trash
-        counter = 1
-        while trash_path.exists():
-            trash_path = self.trash_dir / f"{img_path.stem}_{counter}{img_path.suffix}"
-            counter += 1
+        else:
+            action["index"] = self._idx_in_filtered.get(img_path, self.current_index)
+            self.undo_stack.append(action)
+            self._remove_path_from_view(img_path)
+        if action.get("message"):
+            self.show_animated_overlay(action.pop("message"))
+
+    @staticmethod
+    def _reindex(paths: list[Path], index: dict[Path, int], start: int):
+        for i in range(start, len(paths)):
+            index[paths[i]] = i
+
+    def _replace_path(self, old: Path, new: Path):
+        """Swap old for new wherever old is still listed, shown or cached.
+
+        The rename may land after a search filter or a reload changed the
+        lists, so nothing is assumed about where old is, or that it is there.
+        """
+        index = self._idx_in_filtered.pop(old, None)
+        if index is not None:
+            self.image_files[index] = new
+            self._idx_in_filtered[new] = index
+        a_idx = self._idx_in_all.pop(old, None)
+        if a_idx is not None:
+            self.all_image_files[a_idx] = new
+            self._lower_names[a_idx] = new.name.lower()
+            self._idx_in_all[new] = a_idx
+            self._path_str[new] = str(new)
+        self._path_str.pop(old, None)
+
+        old_s, new_s = str(old), str(new)
+        item = self.filmstrip_item_map.pop(old, None)
+        if item is not None:
+            item.setData(Qt.UserRole, new_s)
+            self.filmstrip_item_map[new] = item
+        if old_s in self.thumb_cache:
+            self.thumb_cache[new_s] = self.thumb_cache.pop(old_s)
 
-        try:
-            shutil.move(str(img_path), str(trash_path))
-            self.undo_stack.append({
-                "action": "delete",
-                "old_path": img_path,
-                "trash_path": trash_path,
-                "index": self.current_index
-            })
-            self._remove_item_from_view(self.current_index)
-        except Exception as e:
-            print(f"failed to trash: {e}")
-
-    def _remove_item_from_view(self, index: int):
+    def _remove_path_from_view(self, img_path: Path):
         self.filmstrip.blockSignals(True)
-        img_path = self.image_files.pop(index)
-
-        if img_path in self.all_image_files:
-            self.all_image_files.remove(img_path)
+        index = self._idx_in_filtered.pop(img_path, None)
+        if index is not None:
+            del self.image_files[index]
+            self._reindex(self.image_files, self._idx_in_filtered, index)
+            self.filmstrip.takeItem(index)
+            # keep showing the same image if the user has moved past this one
+            if index < self.current_index:
+                self.current_index -= 1
+
+        a_idx = self._idx_in_all.pop(img_path, None)
+        if a_idx is not None:
+            del self.all_image_files[a_idx]
+            del self._lower_names[a_idx]
+            self._reindex(self.all_image_files, self._idx_in_all, a_idx)
+        self._path_str.pop(img_path, None)
 
-        self.filmstrip.takeItem(index)
         self.filmstrip_item_map.pop(img_path, None)
         self.filmstrip.blockSignals(False)
 
@@ -649,69 +1104,43 @@ class ImageViewerWidget(QWidget):
         if not self.undo_stack:
             self.show_animated_overlay("no history to undo")
             return
-
         action = self.undo_stack.pop()
-        index = action["index"]
-
-        try:
-            if action["action"] == "rename_inplace":
-                action["new_path"].rename(action["old_path"])
-
-                # Update lists
-                self.image_files[index] = action["old_path"]
-                if action["new_path"] in self.all_image_files:
-                    m_idx = self.all_image_files.index(action["new_path"])
-                    self.all_image_files[m_idx] = action["old_path"]
-
-                # Update filmstrip item
-                item = self.filmstrip.item(index)
-                item.setData(Qt.UserRole, str(action["old_path"]))
-                self.filmstrip_item_map.pop(action["new_path"], None)
-                self.filmstrip_item_map[action["old_path"]] = item
-
-                # Update thumbnail cache
-                if str(action["new_path"]) in self.thumb_cache:
-                    self.thumb_cache[str(action["old_path"])] = self.thumb_cache.pop(str(action["new_path"]))
-
-                self._update_image()
-                self.show_animated_overlay("undo: rename reverted")
-                return
+        if not self._start_file_op(action, undo=True):
+            self.undo_stack.append(action)   # keep it for another try
 
-            elif action["action"] == "move":
-                shutil.move(str(action["new_path"]), str(action["old_path"]))
-            elif action["action"] == "delete":
-                shutil.move(str(action["trash_path"]), str(action["old_path"]))
-
-            # Re-insert into lists
-            self.image_files.insert(index, action["old_path"])
-            if action["old_path"] not in self.all_image_files:
-                self.all_image_files.append(action["old_path"])
-
-            # Recreate filmstrip item
-            item = QListWidgetItem()
-            item.setData(Qt.UserRole, str(action["old_path"]))
-            self.filmstrip.insertItem(index, item)
-            self.filmstrip_item_map[action["old_path"]] = item
-
-            # Load thumbnail if available
-            if str(action["old_path"]) in self.thumb_cache:
-                item.setIcon(QIcon(self.thumb_cache[str(action["old_path"])]))
-            else:
-                # attempt to load quickly
-                reader = QImageReader(str(action["old_path"]))
-                reader.setScaledSize(QSize(100, 100))
-                img = reader.read()
-                if not img.isNull():
-                    pix = QPixmap.fromImage(img)
-                    self.thumb_cache[str(action["old_path"])] = pix
-                    item.setIcon(QIcon(pix))
-
-            self.current_index = index
+    def _apply_undo(self, action: dict):
+        if action["action"] == "rename_inplace":
+            self._forget_pixmap(action["new_path"])
+            self._replace_path(action["new_path"], action["old_path"])
             self._update_image()
-            self.show_animated_overlay("undo: file restored")
+            self.show_animated_overlay("undo: rename reverted")
+            return
+
+        # Re-insert into lists
+        index = min(action["index"], len(self.image_files))
+        self.image_files.insert(index, action["old_path"])
+        self._reindex(self.image_files, self._idx_in_filtered, index)
+        if action["old_path"] not in self._idx_in_all:
+            self._idx_in_all[action["old_path"]] = len(self.all_image_files)
+            self.all_image_files.append(action["old_path"])
+            self._lower_names.append(action["old_path"].name.lower())
+        old_s = self._path_str.setdefault(action["old_path"], str(action["old_path"]))
+
+        # Recreate filmstrip item
+        item = QListWidgetItem()
+        item.setData(Qt.UserRole, old_s)
+        self.filmstrip.insertItem(index, item)
+        self.filmstrip_item_map[action["old_path"]] = item
+
+        # Load thumbnail if available
+        if old_s in self.thumb_cache:
+            item.setIcon(QIcon(self.thumb_cache[old_s]))
+        else:
+            self._schedule_thumbnails()
 
-        except Exception as e:
-            print(f"undo failed: {e}")
+        self.current_index = index
+        self._update_image()
+        self.show_animated_overlay("undo: file restored")
 
     # ----------------------------------------------------------------------
     # Session persistence
@@ -736,6 +1165,7 @@ class ImageViewerWidget(QWidget):
     def resizeEvent(self, event):
         if self.image_files and self.zoom_mode == "fit":
             self._refresh_pixmap_scale()
+            self._ensure_fit_resolution()
         self._position_overlays()
         super().resizeEvent(event)
 
@@ -744,14 +1174,15 @@ class ImageViewerWidget(QWidget):
 
         # --- Global Escape handling ---
         if event.key() == Qt.Key_Escape:
-            if self.input_container.isVisible():
+            if self._visible("input_container"):
                 self.input_container.hide()
+                self._search_timer.stop()
                 self.suggestion_list.hide()
                 self.setFocus()
                 self.mode = ViewerMode.NORMAL
                 self.pre_search_path = None
                 return
-            if self.overlay.isVisible() or self.mode != ViewerMode.NORMAL:
+            if self._visible("overlay") or self.mode != ViewerMode.NORMAL:
                 self.overlay.hide()
                 self.mode = ViewerMode.NORMAL
                 self._update_title()
@@ -763,7 +1194,7 @@ class ImageViewerWidget(QWidget):
             return
 
         if event.key() == Qt.Key_Space and self.mode not in (ViewerMode.RENAME, ViewerMode.SEARCH):
-            if self.overlay.isVisible() or self.mode != ViewerMode.NORMAL:
+            if self._visible("overlay") or self.mode != ViewerMode.NORMAL:
                 self.overlay.hide()
                 self.mode = ViewerMode.NORMAL
                 self._update_title()
@@ -782,109 +1213,156 @@ class ImageViewerWidget(QWidget):
 
         # --- Quick move mode ---
         if self.mode == ViewerMode.QUICK_MOVE:
-            if key in self.folders:
-                folder_name = self.folders[key]
+            folder_name = self.folders.get(key)
+            if folder_name is not None:
                 target = self.directory / folder_name
                 self._handle_action_request(
                     f"move to '{folder_name}'?",
-                    lambda: self._move_to_target(target),
+                    partial(self._move_to_target, target),
                     f"moved to {folder_name}"
                 )
             return
 
-        # --- Quit / go home ---
-        if key == self.keymap["quit"]:
-            if self._escape_or_back():
-                return
-            self._save_current_session()
-            self.go_home.emit()
-            return
+        handler = self._key_dispatch.get(key)
+        if handler is not None and (self.image_files or key in self._keys_without_images):
+            handler()
 
-        # --- Commands that require images ---
-        if not self.image_files and key not in (self.keymap["undo"], self.keymap["search"]):
+    # ----------------------------------------------------------------------
+    # Key handlers
+    # ----------------------------------------------------------------------
+    def _build_key_dispatch(self):
+        """Map each bound key straight to its handler."""
+        # in precedence order for keys bound to more than one action
+        handlers = {
+            "quit": self._on_quit,
+            "prev": self._on_prev,
+            "next": self._on_next,
+            "toggle_filmstrip": self._on_toggle_filmstrip,
+            "toggle_filename": self._on_toggle_filename,
+            "copy": partial(self._clipboard_action, "copy"),
+            "cut": partial(self._clipboard_action, "cut"),
+            "copy_path": partial(self._clipboard_action, "copy_path"),
+            "zoom_in": partial(self._on_zoom, 1.25),
+            "zoom_out": partial(self._on_zoom, 1 / 1.25),
+            "zoom_real": partial(self._on_zoom, None),
+            "rotate_left": partial(self._on_rotate, -90),
+            "rotate_right": partial(self._on_rotate, 90),
+            "fullscreen": self._on_fullscreen,
+            "delete": self._on_delete,
+            "rename": partial(self._open_text_input, ViewerMode.RENAME),
+            "search": partial(self._open_text_input, ViewerMode.SEARCH),
+            "move_mode": self._on_move_mode,
+            "move_custom": self._on_move_custom,
+            "undo": self._undo_last_action,
+            "show_keys": self._toggle_keymap_overlay,
+            "edit_config": self._on_edit_config,
+        }
+        km = self.keymap
+        self._key_dispatch = {}
+        for name, handler in handlers.items():
+            if name in km:
+                self._key_dispatch.setdefault(km[name], handler)
+        self._keys_without_images = {km.get(name) for name in ("quit", "undo", "search")}
+
+    def _on_quit(self):
+        if self._escape_or_back():
             return
-
-        # --- Normal mode keybindings ---
-        if key == self.keymap["prev"]:
-            self.current_index = max(0, self.current_index - 1)
-            self._update_image()
-        elif key == self.keymap["next"]:
-            self.current_index = min(len(self.image_files) - 1, self.current_index + 1)
-            self._update_image()
-        elif key == self.keymap["toggle_filmstrip"]:
-            self.filmstrip.setVisible(not self.filmstrip.isVisible())
-        elif key == self.keymap["toggle_filename"]:
-            self.settings["show_filename"] = not self.settings["show_filename"]
-            self.config["settings"] = self.settings
-            save_config(self.config)
-            state = "on" if self.settings["show_filename"] else "off"
-            self.show_animated_overlay(f"filename overlay: {state}")
-        elif key == self.keymap["copy"]:
-            self._clipboard_action("copy")
-        elif key == self.keymap["cut"]:
-            self._clipboard_action("cut")
-        elif key == self.keymap["copy_path"]:
-            self._clipboard_action("copy_path")
-        elif key == self.keymap["zoom_in"]:
-            self.zoom_mode = "custom"
-            self.zoom_factor *= 1.25
-            self._refresh_pixmap_scale()
-            self._update_title()
-        elif key == self.keymap["zoom_out"]:
-            self.zoom_mode = "custom"
-            self.zoom_factor /= 1.25
-            self._refresh_pixmap_scale()
-            self._update_title()
-        elif key == self.keymap["zoom_real"]:
-            self.zoom_mode = "custom"
+        self._save_current_session()
+        self.go_home.emit()
+
+    def _on_prev(self):
+        self.current_index = max(0, self.current_index - 1)
+        self._schedule_update()
+
+    def _on_next(self):
+        self.current_index = min(len(self.image_files) - 1, self.current_index + 1)
+        self._schedule_update()
+
+    def _on_toggle_filmstrip(self):
+        self.filmstrip.setVisible(not self.filmstrip.isVisible())
+        self._schedule_thumbnails()
+
+    def _on_toggle_filename(self):
+        settings = self.settings
+        show = settings["show_filename"] = not settings["show_filename"]
+        self.config["settings"] = settings
+        self._schedule_config_save()
+        state = "on" if show else "off"
+        self.show_animated_overlay(f"filename overlay: {state}")
+
+    def _on_zoom(self, factor: float | None):
+        """Multiply the zoom by factor, or reset to real size for None."""
+        self.zoom_mode = "custom"
+        if factor is None:
             self.zoom_factor = 1.0
-            self._refresh_pixmap_scale()
-            self._update_title()
-        elif key == self.keymap["rotate_left"]:
-            self.rotation_angle = (self.rotation_angle - 90) % 360
-            self._refresh_pixmap_scale()
-        elif key == self.keymap["rotate_right"]:
-            self.rotation_angle = (self.rotation_angle + 90) % 360
-            self._refresh_pixmap_scale()
-        elif key == self.keymap["fullscreen"]:
-            if self.window().isFullScreen():
-                self.window().showNormal()
-            else:
-                self.window().showFullScreen()
-        elif key == self.keymap["delete"]:
-            self._handle_action_request("trash current image?", self._delete_current, "file trashed")
-        elif key == self.keymap["rename"]:
-            self._open_text_input(ViewerMode.RENAME)
-        elif key == self.keymap["search"]:
-            self._open_text_input(ViewerMode.SEARCH)
-        elif key == self.keymap["move_mode"]:
-            self.mode = ViewerMode.QUICK_MOVE
-            folder_list = "   ".join(f"[ {k} ] {v}" for k, v in self.folders.items())
-            self.show_animated_overlay(
-                f"quick move:\n\n{folder_list}\n\n[space] cancel",
-                auto_hide=False
-            )
-            self._update_title("awaiting quick move target")
-        elif key == self.keymap["move_custom"]:
-            folder = QFileDialog.getExistingDirectory(
-                self, "select destination", str(self.directory),
-                QFileDialog.Options(QFileDialog.DontUseNativeDialog)
+        else:
+            self.zoom_factor *= factor
+        self._request_full_resolution()
+        self._refresh_pixmap_scale()
+        self._update_title()
+
+    def _on_rotate(self, degrees: int):
+        self.rotation_angle = (self.rotation_angle + degrees) % 360
+        self._refresh_pixmap_scale()
+
+    def _on_fullscreen(self):
+        if self.window().isFullScreen():
+            self.window().showNormal()
+        else:
+            self.window().showFullScreen()
+
+    def _on_delete(self):
+        self._handle_action_request("trash current image?", self._delete_current, "file trashed")
+
+    def _on_move_mode(self):
+        self.mode = ViewerMode.QUICK_MOVE
+        folder_list = "   ".join(f"[ {k} ] {v}" for k, v in self.folders.items())
+        self.show_animated_overlay(
+            f"quick move:\n\n{folder_list}\n\n[space] cancel",
+            auto_hide=False
+        )
+        self._update_title("awaiting quick move target")
+
+    @cached_property
+    def _move_dialog(self) -> QFileDialog:
+        # kept between uses so its file system model stays populated
+        dialog = QFileDialog(self, "select destination")
+        dialog.setOption(QFileDialog.DontUseNativeDialog)
+        dialog.setFileMode(QFileDialog.Directory)
+        dialog.setOption(QFileDialog.ShowDirsOnly)
+        return dialog
+
+    def _on_move_custom(self):
+        dialog = self._move_dialog
+        dialog.setDirectory(str(self.directory))
+        if dialog.exec() and dialog.selectedFiles():
+            dest = Path(dialog.selectedFiles()[0])
+            self._handle_action_request(
+                f"move to '{dest.name}'?",
+                partial(self._move_to_target, dest),
+                f"moved to {dest.name}"
             )
-            if folder:
-                dest = Path(folder)
-                self._handle_action_request(
-                    f"move to '{dest.name}'?",
-                    lambda: self._move_to_target(dest),
-                    f"moved to {dest.name}"
-                )
-            self.setFocus()
-        elif key == self.keymap["undo"]:
-            self._undo_last_action()
-        elif key == self.keymap["show_keys"]:
-            self._toggle_keymap_overlay()
-        elif key == self.keymap["edit_config"]:
-            QDesktopServices.openUrl(QUrl.fromLocalFile(str(CONFIG_FILE)))
-            self.show_animated_overlay("config opened.\nrestart app after saving.")
+        self.setFocus()
+
+    def _on_edit_config(self):
+        self._flush_config(final=True)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(str(CONFIG_FILE)))
+        self.show_animated_overlay("config opened.\nrestart app after saving.")
+
+    def _schedule_config_save(self):
+        self._config_flush_pending = True
+        self._config_timer.start()
+
+    def _flush_config(self, final: bool = False):
+        """Write pending settings; final leaves the file pretty-printed and synced."""
+        self._config_timer.stop()
+        if final and (self._config_flush_pending or self._config_compact):
+            save_config(self.config)
+            self._config_compact = False
+        elif self._config_flush_pending:
+            save_config_fast(self.config)
+            self._config_compact = True
+        self._config_flush_pending = False
 
     def _escape_or_back(self) -> bool:
         """Handle Escape/Space when not in input mode. Returns True if action taken."""
@@ -892,44 +1370,45 @@ class ImageViewerWidget(QWidget):
             self._clear_search_filter()
             return True
         if self.pre_search_path is not None:
-            if self.pre_search_path in self.image_files:
-                self.current_index = self.image_files.index(self.pre_search_path)
-            else:
-                self.current_index = 0
+            self.current_index = self._idx_in_filtered.get(self.pre_search_path, 0)
             self.pre_search_path = None
             self._update_image()
             self.show_animated_overlay("returned to previous image")
             return True
         return False
 
+    @cached_property
+    def _keymap_overlay_text(self) -> str:
+        """Keybindings cheat sheet; the keymap only changes on restart."""
+        km = self.keymap
+        return (
+            "--- keybindings ---\n\n"
+            f"{km['search']} : search filename\n"
+            f"{km['next']} : next image\n"
+            f"{km['prev']} : prev image\n"
+            f"{km['zoom_in']} / {km['zoom_out']} : zoom in/out\n"
+            f"{km['zoom_real']} : real size\n"
+            f"{km['copy']} / {km['cut']} : copy/cut image\n"
+            f"{km['copy_path']} : copy file path\n"
+            f"{km['rotate_left']} / {km['rotate_right']} : rotate\n"
+            f"{km['fullscreen']} : fullscreen\n"
+            f"{km['toggle_filmstrip']} : preview strip\n"
+            f"{km['toggle_filename']} : name banner\n"
+            f"{km['move_mode']} : quick move folder\n"
+            f"{km['move_custom']} : custom folder move\n"
+            f"{km['rename']} : rename file\n"
+            f"{km['delete']} : trash file\n"
+            f"{km['undo']} : undo\n"
+            f"{km['edit_config']} : edit config\n"
+            f"{km['quit']} : go home\n"
+        )
+
     def _toggle_keymap_overlay(self):
         if self.overlay.isVisible() and "keybindings" in self.overlay.text():
             self._hide_notification_overlay()
         else:
             self.mode = ViewerMode.CONFIRM  # just to keep overlay persistent
-            km = self.keymap
-            text = (
-                "--- keybindings ---\n\n"
-                f"{km['search']} : search filename\n"
-                f"{km['next']} : next image\n"
-                f"{km['prev']} : prev image\n"
-                f"{km['zoom_in']} / {km['zoom_out']} : zoom in/out\n"
-                f"{km['zoom_real']} : real size\n"
-                f"{km['copy']} / {km['cut']} : copy/cut image\n"
-                f"{km['copy_path']} : copy file path\n"
-                f"{km['rotate_left']} / {km['rotate_right']} : rotate\n"
-                f"{km['fullscreen']} : fullscreen\n"
-                f"{km['toggle_filmstrip']} : preview strip\n"
-                f"{km['toggle_filename']} : name banner\n"
-                f"{km['move_mode']} : quick move folder\n"
-                f"{km['move_custom']} : custom folder move\n"
-                f"{km['rename']} : rename file\n"
-                f"{km['delete']} : trash file\n"
-                f"{km['undo']} : undo\n"
-                f"{km['edit_config']} : edit config\n"
-                f"{km['quit']} : go home\n"
-            )
-            self.show_animated_overlay(text, auto_hide=False)
+            self.show_animated_overlay(self._keymap_overlay_text, auto_hide=False)
 
     def _on_filmstrip_selected(self, index: int):
         if index >= 0:
@@ -938,6 +1417,11 @@ class ImageViewerWidget(QWidget):
 
     def clean_up(self):
         self._save_current_session()
-        if self.worker:
-            self.worker.stop()
-            self.worker.wait()
+        self._flush_config(final=True)
+        self._file_pool.waitForDone()
+        self.worker.stop()
+        self._decode_cancel.set()
+        self._display_pool.clear()
+        self._cancel_prefetch()
+        self._display_pool.waitForDone()
+        QThreadPool.globalInstance().waitForDone()
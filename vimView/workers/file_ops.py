@@ -0,0 +1,76 @@
+import os
+import shutil
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+def _reserve_unique(directory: Path, stem: str, suffix: str) -> Path:
+    """Create an empty placeholder named stem+suffix (or stem_N+suffix) and return it.
+
+    O_EXCL makes the existence check and the reservation one atomic step.
+    """
+    name = stem + suffix
+    counter = 1
+    while True:
+        path = directory / name
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        except FileExistsError:
+            name = f"{stem}_{counter}{suffix}"
+            counter += 1
+            continue
+        os.close(fd)
+        return path
+
+def _move_onto(src: Path, dst: Path):
+    """Move src over the placeholder at dst."""
+    try:
+        os.replace(src, dst)
+    except OSError:
+        # e.g. across filesystems
+        shutil.move(str(src), str(dst))
+
+class FileOpSignals(QObject):
+    # action record, undo, error message ("" on success)
+    done = Signal(object, bool, str)
+
+class FileOp(QRunnable):
+    """Performs one rename/move/trash (or its undo) off the GUI thread.
+
+    action uses the same shape as the viewer's undo records: "action" is
+    "rename_inplace", "move" or "delete", with "old_path" and "new_path" or
+    "trash_path". Forward moves and trashes may land on a numbered name if
+    the tentative destination is taken by the time the job runs; the final
+    path is written back into the record before it is emitted.
+    """
+
+    def __init__(self, signals: FileOpSignals, action: dict, undo: bool = False):
+        super().__init__()
+        self.signals = signals
+        self.action = action
+        self.undo = undo
+
+    def run(self):
+        action = self.action
+        dst_key = "trash_path" if action["action"] == "delete" else "new_path"
+        try:
+            if self.undo:
+                shutil.move(str(action[dst_key]), str(action["old_path"]))
+            elif action["action"] == "rename_inplace":
+                if action["new_path"].exists():
+                    raise FileExistsError("file exists")
+                action["old_path"].rename(action["new_path"])
+            else:
+                dst = action[dst_key]
+                os.makedirs(dst.parent, exist_ok=True)
+                dst = _reserve_unique(dst.parent, dst.stem, dst.suffix)
+                try:
+                    _move_onto(action["old_path"], dst)
+                except OSError:
+                    os.unlink(dst)
+                    raise
+                action[dst_key] = dst
+        except OSError as e:
+            self.signals.done.emit(action, self.undo, str(e))
+            return
+        self.signals.done.emit(action, self.undo, "")
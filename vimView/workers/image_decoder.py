@@ -0,0 +1,48 @@
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal, Qt
+from PySide6.QtGui import QImage, QImageReader
+
+def decode_image(path: str, max_side: int = 0) -> tuple[QImage, bool]:
+    """Decode path, letting the codec downscale to fit max_side (0 = full size).
+
+    Returns the image and whether it is at full resolution.
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    reduced = False
+    if max_side:
+        src = reader.size()
+        if src.isValid() and max(src.width(), src.height()) > max_side:
+            reader.setScaledSize(src.scaled(max_side, max_side, Qt.KeepAspectRatio))
+            reduced = True
+    return reader.read(), not reduced
+
+class DecodeSignals(QObject):
+    # path, generation, image, full resolution
+    done = Signal(str, int, QImage, bool)
+
+class DecodeJob(QRunnable):
+    """Decodes one image on a pool thread and reports back via signals.
+
+    QPixmap may only be created on the GUI thread, so the job hands back a
+    QImage and the receiver converts it. Setting cancel before or during the
+    decode drops the job without emitting.
+    """
+
+    def __init__(self, signals: DecodeSignals, path: str, generation: int, max_side: int = 0,
+                 cancel: threading.Event | None = None):
+        super().__init__()
+        self.signals = signals
+        self.path = path
+        self.generation = generation
+        self.max_side = max_side
+        self.cancel = cancel or threading.Event()
+
+    def run(self):
+        if self.cancel.is_set():
+            return
+        img, full = decode_image(self.path, self.max_side)
+        if self.cancel.is_set():
+            return
+        self.signals.done.emit(self.path, self.generation, img, full)
@@ -1,31 +1,210 @@
-from PySide6.QtCore import QThread, Signal, QMutex, QSize
-from PySide6.QtGui import QImageReader, QPixmap
+import heapq
+import os
+import threading
+import time
+from hashlib import blake2b
+from pathlib import Path
 
-class ThumbnailWorker(QThread):
-    icon_ready = Signal(str, QPixmap)  # path as string, pixmap
+from PySide6.QtCore import (
+    Qt, QObject, QRunnable, QThread, QThreadPool, Signal, QSize, QStandardPaths
+)
+from PySide6.QtGui import QImage, QImageReader
 
-    def __init__(self, image_paths: list):
+try:
+    import pyvips
+    # thumbnails are one-shot; don't let libvips keep their operations around
+    pyvips.cache_set_max(0)
+except (ImportError, OSError):  # optional speed-up; OSError when libvips itself is missing
+    pyvips = None
+
+THUMB_SIZE = 100
+BATCH_SIZE = 16         # thumbnails per icons_ready emission
+BATCH_INTERVAL = 0.05   # ...or seconds since the last one, whichever comes first
+VIPS_MIN_BYTES = 512_000  # smaller files decode fast enough through Qt
+
+_VIPS_FORMATS = {3: QImage.Format_RGB888, 4: QImage.Format_RGBA8888}
+
+def _vips_thumbnail(path_str: str) -> QImage | None:
+    """Shrink-on-load thumbnail through libvips, or None if it can't read the file."""
+    try:
+        vimg = pyvips.Image.thumbnail(path_str, THUMB_SIZE, height=THUMB_SIZE, size="down")
+        if vimg.interpretation != "srgb":
+            vimg = vimg.colourspace("srgb")
+        if vimg.format != "uchar":
+            vimg = vimg.cast("uchar")
+        fmt = _VIPS_FORMATS.get(vimg.bands)
+        if fmt is None:
+            return None
+        data = vimg.write_to_memory()
+    except pyvips.Error:
+        return None
+    # copy() detaches the image from the buffer, which is freed on return
+    return QImage(data, vimg.width, vimg.height, vimg.width * vimg.bands, fmt).copy()
+
+class ThumbnailWorker(QObject):
+    """Decodes thumbnails on demand, nearest-first, on its own thread pool.
+
+    The viewer calls request() with (priority, path) pairs for what the
+    filmstrip currently shows plus a little look-ahead; each call replaces
+    whatever was still waiting, so scrolling away from a region drops its
+    pending work. Up to four runners pop the lowest priority first, leaving
+    headroom for the displayed image.
+
+    Results arrive in batches through icons_ready as lists of (path, image),
+    so the GUI thread handles one event per batch rather than per image.
+    QPixmap may only be created on the GUI thread, so the receiver converts.
+
+    Queued paths carry the cancel flag that was current when they were
+    requested; cancel() sets it, swaps in a fresh one and empties the queue,
+    so decodes already running finish without emitting.
+
+    Thumbnails are also kept as PNGs in the user cache directory, keyed by
+    path, mtime and thumbnail size, so revisiting a folder skips the decode.
+    """
+    icons_ready = Signal(list)  # [(path as string, QImage), ...]
+
+    def __init__(self):
         super().__init__()
-        self.image_paths = list(image_paths)
-        self._is_running = True
-        self._mutex = QMutex()
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._queue: list[tuple[int, int, str]] = []  # heap of (priority, order, path)
+        self._in_flight: dict[str, threading.Event] = {}   # path -> cancel flag of its run
+        self._runners = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(min(QThread.idealThreadCount(), 4))
+        self._cache_dir = Path(
+            QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation)
+        ) / "vimView" / "thumbs"
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            self._cache_dir = None
 
-    def run(self):
-        for img_path in self.image_paths:
-            self._mutex.lock()
-            running = self._is_running
-            self._mutex.unlock()
-            if not running:
-                break
-
-            reader = QImageReader(str(img_path))
-            reader.setScaledSize(QSize(100, 100))
-            img = reader.read()
-            if not img.isNull():
-                pix = QPixmap.fromImage(img)
-                self.icon_ready.emit(str(img_path), pix)
+    def cache_file(self, path_str: str) -> str | None:
+        """PNG path for the current version of path_str, or None if it cannot be cached."""
+        if self._cache_dir is None:
+            return None
+        try:
+            mtime = os.stat(path_str).st_mtime_ns
+        except OSError:
+            return None
+        key = blake2b(f"{path_str}|{mtime}|{THUMB_SIZE}".encode(), digest_size=16).hexdigest()
+        return os.path.join(self._cache_dir, key + ".png")
+
+    def request(self, wanted):
+        """Replace the pending queue with wanted, an iterable of (priority, path)."""
+        with self._lock:
+            # runs from before the last cancel() will drop their result
+            queue = [(priority, order, str(path))
+                     for order, (priority, path) in enumerate(wanted)
+                     if self._in_flight.get(str(path)) is not self._cancel]
+            heapq.heapify(queue)
+            self._queue = queue
+            starting = min(len(queue), self.pool.maxThreadCount()) - self._runners
+            self._runners += max(0, starting)
+        for _ in range(starting):
+            self.pool.start(_ThumbTask(self))
+
+    def _next(self) -> tuple[str, threading.Event] | None:
+        """Pop the most wanted path for a runner, or retire the runner if none is left."""
+        with self._lock:
+            if not self._queue:
+                self._runners -= 1
+                return None
+            path_str = heapq.heappop(self._queue)[2]
+            self._in_flight[path_str] = self._cancel
+            return path_str, self._cancel
+
+    def _finished(self, path_str: str, cancel: threading.Event):
+        with self._lock:
+            # a newer run of the same path may have taken over the entry
+            if self._in_flight.get(path_str) is cancel:
+                del self._in_flight[path_str]
+
+    def cancel(self):
+        """Drop everything queued so far; running decodes finish unseen."""
+        with self._lock:
+            self._cancel.set()
+            self._cancel = threading.Event()
+            self._queue = []
 
     def stop(self):
-        self._mutex.lock()
-        self._is_running = False
-        self._mutex.unlock()
+        """cancel(), then give running tasks a brief chance to wind down."""
+        self.cancel()
+        self.pool.waitForDone(50)
+
+class _ThumbTask(QRunnable):
+    """Serves the worker's queue until it runs dry."""
+
+    def __init__(self, worker: ThumbnailWorker):
+        super().__init__()
+        self.worker = worker
+
+    def run(self):
+        # one reader per runner, retargeted for each file
+        reader = QImageReader()
+        reader.setAutoTransform(True)
+        batch = []
+        last_flush = time.monotonic()
+        while (job := self.worker._next()) is not None:
+            path_str, cancel = job
+            try:
+                img = self._thumbnail(reader, path_str)
+            finally:
+                self.worker._finished(path_str, cancel)
+            # the decode may have taken a while; drop what was gathered if cancelled
+            if cancel.is_set():
+                batch = []
+                continue
+            if img is not None:
+                batch.append((path_str, img))
+            if batch and (len(batch) >= BATCH_SIZE
+                          or time.monotonic() - last_flush > BATCH_INTERVAL):
+                self.worker.icons_ready.emit(batch)
+                batch = []
+                last_flush = time.monotonic()
+        if batch:
+            self.worker.icons_ready.emit(batch)
+
+    def _thumbnail(self, reader: QImageReader, path_str: str) -> QImage | None:
+        cache_file = self.worker.cache_file(path_str)
+        if cache_file is not None:
+            img = QImage()
+            if img.load(cache_file, "PNG"):
+                return img
+
+        img = None
+        if pyvips is not None:
+            try:
+                if os.path.getsize(path_str) > VIPS_MIN_BYTES:
+                    img = _vips_thumbnail(path_str)
+            except OSError:
+                return None
+        if img is None:
+            img = self._qt_thumbnail(reader, path_str)
+        if img is None:
+            return None
+        if cache_file is not None and not os.path.exists(cache_file):
+            tmp = f"{cache_file}.{threading.get_ident()}.tmp"
+            if img.save(tmp, "PNG"):
+                try:
+                    os.replace(tmp, cache_file)
+                except OSError:
+                    pass
+        return img
+
+    def _qt_thumbnail(self, reader: QImageReader, path_str: str) -> QImage | None:
+        reader.setFileName(path_str)
+        # Integer downscale to about twice the thumbnail size, which lets
+        # the JPEG decoder use its cheap DCT scaling; the final step below
+        # smooths to size and keeps the aspect ratio.
+        src = reader.size()
+        if src.isValid():
+            scale = max(1, min(src.width(), src.height()) // (2 * THUMB_SIZE))
+            reader.setScaledSize(QSize(src.width() // scale, src.height() // scale))
+        else:
+            reader.setScaledSize(QSize())  # don't carry the last file's size over
+        img = reader.read()
+        if img.isNull():
+            return None
+        return img.scaled(THUMB_SIZE, THUMB_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)